@@ -9,14 +9,23 @@ en texto plano una vez que se valida el acceso con ``admin`` y ``1234``.
 from __future__ import annotations
 
 import base64
+import hmac
 import json
 import os
+import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from getpass import getpass
-from hashlib import sha256
+from hashlib import scrypt, sha256
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:  # pragma: no cover - dependencia opcional
+    import orjson
+except ImportError:  # pragma: no cover - se usa la librería estándar
+    orjson = None  # type: ignore[assignment]
 
 
 def _resolve_data_file() -> Path:
@@ -30,6 +39,7 @@ def _resolve_data_file() -> Path:
 
 
 DATA_FILE = _resolve_data_file()
+PRETTY_JSON = os.environ.get("PASSWORD_MANAGER_PRETTY") == "1"
 BASE_DIR = Path(__file__).resolve().parent
 
 
@@ -42,9 +52,16 @@ def _legacy_file_candidates() -> Iterator[Path]:
 
 
 LEGACY_FILE_CANDIDATES = tuple(dict.fromkeys(path for path in _legacy_file_candidates()))
+LEGACY_RECORD_PATTERN = re.compile(
+    r"^[ \t]*Sitio web / Aplicación:[ \t]*(.*?)[ \t]*\n"
+    r"\s*Usuario / Correo:[ \t]*(.*?)[ \t]*\n"
+    r"\s*Contraseña:[ \t]*(.*?)[ \t]*$",
+    re.MULTILINE,
+)
 
 ADMIN_USERNAME = "admin"
-ADMIN_PASSWORD_HASH = sha256("1234".encode("utf-8")).hexdigest()
+ADMIN_PASSWORD_SALT = b"password-manager/admin"
+SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1, "dklen": 32}
 
 
 # === Utilidades de estilo === #
@@ -59,12 +76,14 @@ MAGENTA = "\033[95m"
 YELLOW = "\033[93m"
 GREEN = "\033[92m"
 RED = "\033[91m"
+CLEAR = "\033[H\033[2J\033[3J"
 
 
 def clear_screen() -> None:
     """Limpia la terminal para ofrecer una experiencia más cuidada."""
 
-    os.system("cls" if os.name == "nt" else "clear")
+    sys.stdout.write(CLEAR)
+    sys.stdout.flush()
 
 
 def highlight(text: str, colour: str = CYAN, *, bold: bool = False) -> str:
@@ -76,12 +95,17 @@ def highlight(text: str, colour: str = CYAN, *, bold: bool = False) -> str:
     return f"{prefix}{text}{RESET}"
 
 
+HEADER_WIDTH = 56
+HEADER = "{banner}\n{title}\n{banner}".format(
+    banner="═" * HEADER_WIDTH,
+    title=highlight("Administrador de Contraseñas", colour=MAGENTA, bold=True).center(HEADER_WIDTH),
+)
+
+
 def print_header() -> None:
     """Muestra el encabezado principal del gestor."""
 
-    banner = "═" * 56
-    title = highlight("Administrador de Contraseñas", colour=MAGENTA, bold=True)
-    print(f"{banner}\n{title.center(56)}\n{banner}")
+    print(HEADER)
 
 
 def pause(message: str = "Presione Enter para continuar...") -> None:
@@ -99,28 +123,54 @@ def hash_text(text: str) -> str:
     return sha256(text.encode("utf-8")).hexdigest()
 
 
+def stretch_password(password: str) -> bytes:
+    """Aplica scrypt a la contraseña para dificultar ataques de fuerza bruta."""
+
+    return scrypt(password.encode("utf-8"), salt=ADMIN_PASSWORD_SALT, **SCRYPT_PARAMS)
+
+
+@lru_cache(maxsize=1)
+def _admin_digest() -> bytes:
+    """Calcula, solo la primera vez que se necesita, el resumen del administrador."""
+
+    return stretch_password("1234")
+
+
+@lru_cache(maxsize=4)
 def _derive_xor_key(password: str) -> bytes:
     """Deriva una clave a partir de la contraseña del administrador."""
 
     return sha256(password.encode("utf-8")).digest()
 
 
+def _xor_bytes(data: bytes, key: bytes) -> bytes:
+    """Aplica el XOR de ``data`` con la clave repetida en una sola operación."""
+
+    size = len(data)
+    keystream = (key * (size // len(key) + 1))[:size]
+    mixed = int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+    return mixed.to_bytes(size, "big")
+
+
 def encrypt_password(raw_password: str, admin_password: str) -> str:
     """Cifra la contraseña usando un XOR con la clave derivada."""
 
     key = _derive_xor_key(admin_password)
-    data = raw_password.encode("utf-8")
-    encrypted = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
-    return base64.urlsafe_b64encode(encrypted).decode("utf-8")
+    encrypted = _xor_bytes(raw_password.encode("utf-8"), key)
+    return base64.urlsafe_b64encode(encrypted).decode("ascii")
+
+
+def _decrypt_with_key(encrypted_password: str, key: bytes) -> str:
+    """Descifra una contraseña usando una clave ya derivada."""
+
+    data = base64.urlsafe_b64decode(encrypted_password)
+    return _xor_bytes(data, key).decode("utf-8")
 
 
 def decrypt_password(encrypted_password: str, admin_password: str) -> str:
     """Descifra la contraseña cifrada con ``encrypt_password``."""
 
-    key = _derive_xor_key(admin_password)
-    data = base64.urlsafe_b64decode(encrypted_password.encode("utf-8"))
-    decrypted = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
-    return decrypted.decode("utf-8")
+    return _decrypt_with_key(encrypted_password, _derive_xor_key(admin_password))
 
 
 # === Persistencia de datos === #
@@ -129,36 +179,96 @@ def decrypt_password(encrypted_password: str, admin_password: str) -> str:
 Entry = Dict[str, str]
 
 
-def load_entries() -> List[Entry]:
-    """Lee los registros almacenados en el fichero JSON."""
+def _dumps(data: Any) -> bytes:
+    """Serializa a JSON usando ``orjson`` si está disponible.
+
+    La salida es compacta salvo que ``PRETTY_JSON`` pida sangría legible.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY_JSON else None)
+    if PRETTY_JSON:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """Interpreta JSON usando ``orjson`` si está disponible."""
+
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def load_entries() -> Optional[List[Entry]]:
+    """Lee los registros almacenados en el fichero JSON.
+
+    Devuelve ``None`` si el fichero no se puede interpretar, para que quien
+    llama no lo sobrescriba con una lista vacía.
+    """
 
     if not DATA_FILE.exists():
         return []
 
     try:
-        with DATA_FILE.open("r", encoding="utf-8") as fp:
-            data = json.load(fp)
+        data = _loads(DATA_FILE.read_bytes())
         if not isinstance(data, list):  # type: ignore[unreachable]
             raise ValueError("El formato del archivo es inválido.")
         return [entry for entry in data if isinstance(entry, dict)]
-    except json.JSONDecodeError as exc:  # pragma: no cover - difícil de forzar en pruebas
+    except ValueError as exc:  # pragma: no cover - difícil de forzar en pruebas
         print(highlight("Error al leer el archivo de datos.", RED, bold=True))
         print(highlight(str(exc), RED))
-        return []
+        return None
 
 
 def save_entries(entries: Iterable[Entry]) -> None:
-    """Guarda los registros en disco con sangría para lectura sencilla."""
-
-    DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with DATA_FILE.open("w", encoding="utf-8") as fp:
-        json.dump(list(entries), fp, indent=2, ensure_ascii=False)
+    """Guarda los registros en disco.
 
+    Se escribe primero en un fichero temporal y después se reemplaza el
+    original, de modo que una interrupción no deja el fichero a medias.
+    """
 
-def build_entry(site: str, username: str, password: str, admin_password: str) -> Entry:
-    """Crea la estructura de un registro listo para almacenar."""
+    DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = DATA_FILE.with_name(DATA_FILE.name + ".tmp")
+    payload = entries if isinstance(entries, list) else list(entries)
+    try:
+        mode = DATA_FILE.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o600
 
-    now = datetime.utcnow().isoformat()
+    try:
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(_dumps(payload))
+        # Se conservan los permisos del fichero original tras reemplazarlo.
+        os.chmod(tmp_file, mode)
+        os.replace(tmp_file, DATA_FILE)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def utc_timestamp() -> str:
+    """Devuelve la fecha y hora UTC actual en formato ISO sin zona horaria."""
+
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def build_entry(
+    site: str,
+    username: str,
+    password: str,
+    admin_password: str,
+    *,
+    timestamp: Optional[str] = None,
+) -> Entry:
+    """Crea la estructura de un registro listo para almacenar.
+
+    ``timestamp`` permite compartir la misma marca temporal entre registros
+    creados en bloque, como en la migración del formato antiguo.
+    """
+
+    now = timestamp or utc_timestamp()
     return {
         "site": site.strip(),
         "username": username.strip(),
@@ -191,18 +301,12 @@ def ensure_storage(admin_password: str) -> None:
         save_entries([])
         return
 
-    entries: List[Entry] = []
-    with legacy_file.open("r", encoding="utf-8") as fp:
-        lines = [line.strip() for line in fp.readlines() if line.strip()]
-
-    for i in range(0, len(lines), 3):
-        try:
-            site = lines[i].replace("Sitio web / Aplicación: ", "")
-            username = lines[i + 1].replace("Usuario / Correo: ", "")
-            password = lines[i + 2].replace("Contraseña: ", "")
-        except IndexError:
-            continue
-        entries.append(build_entry(site, username, password, admin_password))
+    text = legacy_file.read_text(encoding="utf-8")
+    now = utc_timestamp()
+    entries = [
+        build_entry(site, username, password, admin_password, timestamp=now)
+        for site, username, password in LEGACY_RECORD_PATTERN.findall(text)
+    ]
 
     save_entries(entries)
     try:
@@ -210,6 +314,16 @@ def ensure_storage(admin_password: str) -> None:
     except OSError:
         pass
 
+    expected = text.count("Sitio web / Aplicación:")
+    if len(entries) < expected:
+        print(highlight(
+            f"Solo se migraron {len(entries)} de {expected} registros de {legacy_file}. "
+            "Revise la copia .bak para recuperar el resto.",
+            YELLOW,
+            bold=True,
+        ))
+        pause()
+
 
 # === Lógica de autenticación === #
 
@@ -217,7 +331,13 @@ def ensure_storage(admin_password: str) -> None:
 def authenticate(username: str, password: str) -> bool:
     """Comprueba si las credenciales corresponden al administrador."""
 
-    return username == ADMIN_USERNAME and hash_text(password) == ADMIN_PASSWORD_HASH
+    # Se descartan entradas vacías antes de calcular el costoso scrypt.
+    if not username or not password:
+        return False
+
+    return username == ADMIN_USERNAME and hmac.compare_digest(
+        stretch_password(password), _admin_digest()
+    )
 
 
 def prompt_admin_login() -> Optional[str]:
@@ -266,25 +386,19 @@ def draw_table(headers: List[str], rows: List[List[str]]) -> None:
         print(highlight("No hay registros para mostrar.", YELLOW, bold=True))
         return
 
-    column_widths = [len(header) for header in headers]
-    for row in rows:
-        for idx, cell in enumerate(row):
-            column_widths[idx] = max(column_widths[idx], len(cell))
+    column_widths = [max(map(len, column)) for column in zip(headers, *rows)]
 
-    border = "╔" + "╦".join("═" * (width + 2) for width in column_widths) + "╗"
-    separator = "╠" + "╬".join("═" * (width + 2) for width in column_widths) + "╣"
-    footer = "╚" + "╩".join("═" * (width + 2) for width in column_widths) + "╝"
+    bars = ["═" * (width + 2) for width in column_widths]
+    border = "╔" + "╦".join(bars) + "╗"
+    separator = "╠" + "╬".join(bars) + "╣"
+    footer = "╚" + "╩".join(bars) + "╝"
 
-    def format_row(row: List[str]) -> str:
-        cells = [f" {cell.ljust(width)} " for cell, width in zip(row, column_widths)]
-        return "║" + "║".join(cells) + "║"
+    row_format = "║ " + " ║ ".join(f"{{:<{width}}}" for width in column_widths) + " ║"
 
-    print(border)
-    print(format_row(headers))
-    print(separator)
-    for row in rows:
-        print(format_row(row))
-    print(footer)
+    lines = [border, row_format.format(*headers), separator]
+    lines.extend(row_format.format(*row) for row in rows)
+    lines.append(footer)
+    print("\n".join(lines))
 
 
 def collect_filter(entries: List[Entry]) -> List[Entry]:
@@ -297,25 +411,27 @@ def collect_filter(entries: List[Entry]) -> List[Entry]:
     print("4. Fecha de actualización (más recientes primero)")
 
     option = input("Elija una opción (Enter para omitir): ").strip()
-    filtered = entries[:]
-
-    if option == "1":
-        filtered.sort(key=lambda item: item["site"].lower())
-    elif option == "2":
-        filtered.sort(key=lambda item: item["username"].lower())
-    elif option == "3":
-        filtered.sort(key=lambda item: item["created_at"], reverse=True)
-    elif option == "4":
-        filtered.sort(key=lambda item: item["updated_at"], reverse=True)
-
     term = input("Filtrar por texto (sitio, usuario o contraseña) [Enter para todos]: ").strip().lower()
+
+    # Se filtra antes de ordenar para no ordenar registros que se descartan.
     if term:
         filtered = [
             entry
-            for entry in filtered
+            for entry in entries
             if term in entry["site"].lower()
             or term in entry["username"].lower()
         ]
+    else:
+        filtered = entries[:]
+
+    if option == "1":
+        filtered.sort(key=lambda item: item["site"].lower())
+    elif option == "2":
+        filtered.sort(key=lambda item: item["username"].lower())
+    elif option == "3":
+        filtered.sort(key=itemgetter("created_at"), reverse=True)
+    elif option == "4":
+        filtered.sort(key=itemgetter("updated_at"), reverse=True)
 
     return filtered
 
@@ -323,7 +439,7 @@ def collect_filter(entries: List[Entry]) -> List[Entry]:
 # === Acciones del gestor === #
 
 
-def add_entry(admin_password: str) -> None:
+def add_entry(admin_password: str, entries: List[Entry]) -> None:
     """Añade una nueva credencial al gestor."""
 
     clear_screen()
@@ -340,7 +456,6 @@ def add_entry(admin_password: str) -> None:
         pause()
         return
 
-    entries = load_entries()
     entries.append(build_entry(site, username, password, admin_password))
     save_entries(entries)
 
@@ -348,12 +463,11 @@ def add_entry(admin_password: str) -> None:
     pause()
 
 
-def list_entries(admin_password: str) -> None:
+def list_entries(admin_password: str, entries: List[Entry]) -> None:
     """Muestra las credenciales guardadas con diferentes vistas."""
 
     clear_screen()
     print_header()
-    entries = load_entries()
 
     if not entries:
         print(highlight("Aún no hay credenciales guardadas.", YELLOW, bold=True))
@@ -362,10 +476,11 @@ def list_entries(admin_password: str) -> None:
 
     filtered = collect_filter(entries)
 
+    key = _derive_xor_key(admin_password)
     rows: List[List[str]] = []
     for idx, entry in enumerate(filtered, start=1):
         try:
-            password_plain = decrypt_password(entry["password_encrypted"], admin_password)
+            password_plain = _decrypt_with_key(entry["password_encrypted"], key)
         except Exception:  # pragma: no cover - protección adicional
             password_plain = highlight("Error al descifrar", RED)
 
@@ -415,13 +530,12 @@ def select_entry(entries: List[Entry]) -> Optional[int]:
     return None
 
 
-def edit_entry(admin_password: str) -> None:
+def edit_entry(admin_password: str, entries: List[Entry]) -> None:
     """Permite modificar un registro existente."""
 
     clear_screen()
     print_header()
     print(highlight("Editar credencial", MAGENTA, bold=True))
-    entries = load_entries()
     index = select_entry(entries)
     if index is None:
         return
@@ -433,6 +547,11 @@ def edit_entry(admin_password: str) -> None:
     new_username = input(f"Nuevo usuario [{entry['username']}]: ").strip()
     new_password = getpass("Nueva contraseña (dejar en blanco para mantener): ")
 
+    if not new_site and not new_username and not new_password:
+        print(highlight("No se realizaron cambios.", YELLOW, bold=True))
+        pause()
+        return
+
     if new_site:
         entry["site"] = new_site
     if new_username:
@@ -441,20 +560,19 @@ def edit_entry(admin_password: str) -> None:
         entry["password_hash"] = hash_text(new_password)
         entry["password_encrypted"] = encrypt_password(new_password, admin_password)
 
-    entry["updated_at"] = datetime.utcnow().isoformat()
+    entry["updated_at"] = utc_timestamp()
     save_entries(entries)
 
     print(highlight("Credencial actualizada correctamente.", GREEN, bold=True))
     pause()
 
 
-def delete_entry() -> None:
+def delete_entry(entries: List[Entry]) -> None:
     """Elimina un registro existente."""
 
     clear_screen()
     print_header()
     print(highlight("Eliminar credencial", MAGENTA, bold=True))
-    entries = load_entries()
     index = select_entry(entries)
     if index is None:
         return
@@ -473,10 +591,18 @@ def delete_entry() -> None:
 # === Programa principal === #
 
 
-def main_menu(admin_password: str) -> None:
-    """Controla el flujo principal del administrador."""
+def main_menu(admin_password: str) -> bool:
+    """Controla el flujo principal del administrador.
+
+    Devuelve ``False`` si no se pudo leer el almacenamiento.
+    """
 
     ensure_storage(admin_password)
+    entries = load_entries()
+    if entries is None:
+        print(highlight(f"No se modificará {DATA_FILE}. Revíselo o restáurelo.", YELLOW))
+        pause()
+        return False
 
     while True:
         clear_screen()
@@ -491,17 +617,17 @@ def main_menu(admin_password: str) -> None:
         option = input("Opción elegida: ").strip()
 
         if option == "1":
-            add_entry(admin_password)
+            add_entry(admin_password, entries)
         elif option == "2":
-            list_entries(admin_password)
+            list_entries(admin_password, entries)
         elif option == "3":
-            edit_entry(admin_password)
+            edit_entry(admin_password, entries)
         elif option == "4":
-            delete_entry()
+            delete_entry(entries)
         elif option == "5":
             clear_screen()
             print(highlight("¡Hasta pronto!", GREEN, bold=True))
-            break
+            return True
         else:
             print(highlight("Opción no válida.", RED, bold=True))
             pause()
@@ -510,11 +636,16 @@ def main_menu(admin_password: str) -> None:
 def main() -> None:
     """Punto de entrada del script."""
 
+    if os.name == "nt":
+        # Activa el procesamiento de secuencias ANSI en la consola de Windows.
+        os.system("")
+
     admin_password = prompt_admin_login()
     if admin_password is None:
         sys.exit(1)
 
-    main_menu(admin_password)
+    if not main_menu(admin_password):
+        sys.exit(1)
 
 
 if __name__ == "__main__":